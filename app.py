@@ -1,6 +1,10 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import plotly.graph_objects as go
+import ahocorasick
 from groq import Groq
 
 # 1. Page Configuration
@@ -8,43 +12,147 @@ st.set_page_config(layout="wide", page_title="Voice of Customer Intelligence Eng
 st.title("Voice of Customer Intelligence Engine")
 
 # 2. Load Data
-@st.cache_data
+# cache_resource hands back the same frame on every rerun without hashing or
+# copying it, so treat the result as read-only
+@st.cache_resource
 def load_data():
-    return pd.read_csv('cleaned_reviews.csv')
+    # Parquet keeps the ETL schema (int8 score, categorical sentiment), so only prune columns
+    df = pd.read_parquet(
+        'cleaned_reviews.parquet',
+        columns=['Sentiment_Category', 'review_score', 'review_comment_message'],
+    )
+    df['review_comment_message'] = df['review_comment_message'].fillna('')
+    # Dictionary-encode the messages when canned replies ("Muito bom", ...) dominate
+    if df['review_comment_message'].nunique() < len(df) / 2:
+        df['review_comment_message'] = df['review_comment_message'].astype('category')
+    return df
+
+# Lowercase the distinct messages once into a single \x00-delimited corpus plus
+# each message's start offset, so a search is one automaton pass over the text;
+# codes map every row back to its distinct message
+@st.cache_resource
+def load_search_index():
+    codes, uniques = pd.factorize(load_data()['review_comment_message'])
+    messages = [m.lower() for m in uniques]
+    lengths = np.fromiter((len(m) + 1 for m in messages), dtype=np.int64, count=len(messages))
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    return '\x00'.join(messages), starts, codes
+
+# Rows matching any of the terms, found with one Aho-Corasick pass; bounded so
+# one-off searches don't pile up a row-length mask each for the process lifetime
+@st.cache_data(max_entries=64)
+def search_hits(terms):
+    automaton = ahocorasick.Automaton()
+    for term in terms:
+        automaton.add_word(term, term)
+    automaton.make_automaton()
+    corpus, starts, codes = load_search_index()
+    ends = np.fromiter((end for end, _ in automaton.iter(corpus)), dtype=np.int64)
+    hits = np.zeros(len(starts), dtype=bool)
+    hits[np.searchsorted(starts, ends, side='right') - 1] = True
+    return hits[codes]
+
+# Sidebar options come straight from the category dtype, computed once per load
+@st.cache_resource
+def load_sentiment_options():
+    return tuple(sorted(load_data()['Sentiment_Category'].cat.categories))
+
+# Rows with a non-empty message, so LLM sampling can pick positions directly
+@st.cache_resource
+def load_nonempty_mask():
+    return load_data()['review_comment_message'].to_numpy() != ''
+
+# Filter on the int category codes rather than hashing each label
+def sentiment_mask(data, sentiments):
+    col = data['Sentiment_Category']
+    selected_codes = col.cat.categories.get_indexer(list(sentiments))
+    return np.isin(col.cat.codes.to_numpy(), selected_codes[selected_codes >= 0])
+
+# Row positions for a sentiment selection. Everything downstream (aggregates,
+# search, LLM sampling) is keyed on the selection only and goes through here,
+# so reruns caused by other widgets are served from the cache
+@st.cache_data
+def select_positions(sentiments):
+    return np.flatnonzero(sentiment_mask(load_data(), sentiments))
+
+# Both keys are small ints (category codes, 1-5 stars), so bincount replaces groupby
+@st.cache_data
+def sentiment_counts(sentiments):
+    col = load_data()['Sentiment_Category']
+    counts = np.bincount(col.cat.codes.to_numpy()[select_positions(sentiments)], minlength=len(col.cat.categories))
+    out = pd.DataFrame({'Sentiment_Category': col.cat.categories, 'count': counts})
+    return out[out['count'] > 0].reset_index(drop=True)
+
+@st.cache_data
+def kpi_counts(sentiments):
+    # Reuses the sentiment distribution instead of counting the codes again
+    counts = sentiment_counts(sentiments)
+    by_label = dict(zip(counts['Sentiment_Category'], counts['count']))
+    return int(counts['count'].sum()), int(by_label.get('Positive', 0)), int(by_label.get('Negative', 0))
+
+@st.cache_data
+def score_counts(sentiments):
+    scores = load_data()['review_score'].to_numpy()[select_positions(sentiments)]
+    counts = np.bincount(scores, minlength=6)
+    out = pd.DataFrame({'review_score': np.arange(len(counts)), 'count': counts})
+    return out[out['count'] > 0].reset_index(drop=True)
 
 df = load_data()
+sentiment_options = load_sentiment_options()
 
 # 3. Sidebar Filters
 st.sidebar.header("Filters")
 sentiment_filter = st.sidebar.multiselect(
     "Sentiment Category",
-    options=df['Sentiment_Category'].unique(),
-    default=df['Sentiment_Category'].unique()
+    options=sentiment_options,
+    default=sentiment_options
 )
 
-filtered_df = df[df['Sentiment_Category'].isin(sentiment_filter)]
+# Carry row positions rather than a copied frame; rows are only materialized for display
+sentiment_key = tuple(sorted(sentiment_filter))
+filt_idx = select_positions(sentiment_key)
 
 # 4. KPI Metrics
+total_reviews, positive_reviews, negative_reviews = kpi_counts(sentiment_key)
 col1, col2, col3 = st.columns(3)
-col1.metric("Total Reviews", len(filtered_df))
-col2.metric("Positive Reviews", len(filtered_df[filtered_df['Sentiment_Category'] == 'Positive']))
-col3.metric("Negative Reviews", len(filtered_df[filtered_df['Sentiment_Category'] == 'Negative']))
+col1.metric("Total Reviews", total_reviews)
+col2.metric("Positive Reviews", positive_reviews)
+col3.metric("Negative Reviews", negative_reviews)
 
 # 5. Visualizations
 col_chart1, col_chart2 = st.columns(2)
 with col_chart1:
     st.subheader("Sentiment Distribution")
-    fig_pie = px.pie(filtered_df, names='Sentiment_Category', 
-                     color='Sentiment_Category',
-                     color_discrete_map={'Positive':'#636EFA', 'Negative':'#EF553B', 'Neutral':'#FECB52'})
+    # Build from the pre-aggregated counts so only a handful of values are serialized
+    sent = sentiment_counts(sentiment_key)
+    colors = {'Positive':'#636EFA', 'Negative':'#EF553B', 'Neutral':'#FECB52'}
+    fig_pie = go.Figure(go.Pie(labels=sent['Sentiment_Category'], values=sent['count'],
+                               marker=dict(colors=[colors.get(c) for c in sent['Sentiment_Category']])))
     st.plotly_chart(fig_pie, use_container_width=True)
 
 with col_chart2:
     st.subheader("Review Score Distribution")
-    fig_bar = px.histogram(filtered_df, x='review_score', nbins=5, text_auto=True)
+    scores = score_counts(sentiment_key)
+    fig_bar = go.Figure(go.Bar(x=scores['review_score'], y=scores['count'], text=scores['count']))
+    fig_bar.update_layout(xaxis_title='review_score', yaxis_title='count')
     st.plotly_chart(fig_bar, use_container_width=True)
 
-# --- 6. FREE LLAMA 3 INTEGRATION (GROQ) ---
+# --- 6. AI INSIGHT SEARCH ---
+st.markdown("---")
+st.subheader("🔍 AI Insight Search")
+
+# Inside a form the input only commits (and reruns the script) on submit, not per keystroke
+with st.form("search_form"):
+    search_term = st.text_input("Search reviews for keywords, comma-separated (e.g., 'atraso, quebrado, devolução')")
+    st.form_submit_button("Search")
+search_terms = tuple(sorted({t.strip().lower() for t in search_term.split(',') if t.strip()}))
+
+if search_terms:
+    insight_idx = filt_idx[search_hits(search_terms)[filt_idx]]
+    st.caption(f"{len(insight_idx)} matching reviews")
+    st.dataframe(df[['review_score', 'Sentiment_Category', 'review_comment_message']].take(insight_idx), use_container_width=True)
+
+# --- 7. FREE LLAMA 3 INTEGRATION (GROQ) ---
 st.markdown("---")
 st.subheader("🤖 AI Strategic Advisor (Powered by Llama 3)")
 
@@ -57,8 +165,12 @@ if st.button("Generate Insight"):
     if user_question:
         with st.spinner("Consulting Llama 3..."):
             # Sample data to save tokens
-            sample_reviews = filtered_df['review_comment_message'].dropna().sample(min(50, len(filtered_df))).tolist()
-            reviews_text = "\n".join(sample_reviews)
+            candidates = filt_idx[load_nonempty_mask()[filt_idx]]
+            pick = np.random.default_rng().choice(candidates, size=min(50, len(candidates)), replace=False)
+            # The join runs as an Arrow kernel rather than a Python str.join loop
+            sample_arr = pa.array(df['review_comment_message'].take(pick)).cast(pa.string())
+            sample_list = pa.ListArray.from_arrays([0, len(sample_arr)], sample_arr)
+            reviews_text = pc.binary_join(sample_list, "\n")[0].as_py()
             
             prompt = f"""
             You are a Senior Business Analyst. 
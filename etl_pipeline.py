@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 
 # Load the dataset
 df = pd.read_csv('olist_order_reviews_dataset.csv')
@@ -8,18 +9,15 @@ df = df.dropna(subset=['review_comment_message'])
 
 # --- THE FIX: Use Star Rating for Sentiment Category ---
 # This ensures your dashboard looks colorful and accurate
-def categorize_by_score(score):
-    if score <= 2:
-        return 'Negative'
-    elif score == 3:
-        return 'Neutral'
-    else:
-        return 'Positive'
+# 1-2 stars -> Negative, 3 -> Neutral, 4-5 -> Positive (vectorized, no per-row Python call)
+score = df['review_score'].to_numpy()
+df['Sentiment_Category'] = pd.Categorical.from_codes(
+    np.where(score <= 2, 0, np.where(score == 3, 1, 2)),
+    categories=['Negative', 'Neutral', 'Positive']
+)
 
-# Apply the function
-df['Sentiment_Category'] = df['review_score'].apply(categorize_by_score)
-
-# Save the cleaned data
-df.to_csv('cleaned_reviews.csv', index=False)
+# Save the cleaned data as Parquet so the app gets the schema back without re-parsing
+df['review_score'] = df['review_score'].astype('int8')
+df.to_parquet('cleaned_reviews.parquet', index=False, compression='zstd')
 
 print(f"Processing complete. {len(df)} rows saved with Star-Based Sentiment.")
\ No newline at end of file